@@ -6,8 +6,187 @@ This script calculates the required sample size and test duration for
 A/B testing email campaigns on repo-stage customers.
 """
 
+import functools
 import math
-from scipy import stats
+import sys
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; the kernels then run as plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+    prange = range
+
+
+# Coefficients for Acklam's rational approximation of the normal quantile
+_ACKLAM_A = (-3.969683028665376e+01, 2.209460984245205e+02,
+             -2.759285104469687e+02, 1.383577518672690e+02,
+             -3.066479806614716e+01, 2.506628277459239e+00)
+_ACKLAM_B = (-5.447609879822406e+01, 1.615858368580409e+02,
+             -1.556989798598866e+02, 6.680131188771972e+01,
+             -1.328068155288572e+01)
+_ACKLAM_C = (-7.784894002430293e-03, -3.223964580411365e-01,
+             -2.400758277161838e+00, -2.549732539343734e+00,
+             4.374664141464968e+00, 2.938163982698783e+00)
+_ACKLAM_D = (7.784695709041462e-03, 3.224671290700398e-01,
+             2.445134137142996e+00, 3.754408661907416e+00)
+_ACKLAM_P_LOW = 0.02425
+_ACKLAM_P_HIGH = 1 - _ACKLAM_P_LOW
+
+
+@njit(cache=True)
+def _acklam_ndtri(p):
+    """
+    Standard normal quantile via Acklam's rational approximation.
+
+    The raw approximation has a relative error of about 1.15e-9; one Halley
+    step against math.erfc refines it to full double precision.
+    """
+    a, b, c, d = _ACKLAM_A, _ACKLAM_B, _ACKLAM_C, _ACKLAM_D
+
+    if p < _ACKLAM_P_LOW:
+        q = math.sqrt(-2 * math.log(p))
+        x = ((((((c[0]*q + c[1])*q + c[2])*q + c[3])*q + c[4])*q + c[5]) /
+             ((((d[0]*q + d[1])*q + d[2])*q + d[3])*q + 1))
+    elif p <= _ACKLAM_P_HIGH:
+        q = p - 0.5
+        r = q * q
+        x = ((((((a[0]*r + a[1])*r + a[2])*r + a[3])*r + a[4])*r + a[5]) * q /
+             (((((b[0]*r + b[1])*r + b[2])*r + b[3])*r + b[4])*r + 1))
+    else:
+        q = math.sqrt(-2 * math.log(1 - p))
+        x = -((((((c[0]*q + c[1])*q + c[2])*q + c[3])*q + c[4])*q + c[5]) /
+              ((((d[0]*q + d[1])*q + d[2])*q + d[3])*q + 1))
+
+    # Halley refinement; the upper half is evaluated through 1 - p, which is
+    # exact there, to avoid cancellation in the residual
+    if x < 0:
+        e = 0.5 * math.erfc(-x / math.sqrt(2)) - p
+    else:
+        e = (1 - p) - 0.5 * math.erfc(x / math.sqrt(2))
+    u = e * math.sqrt(2 * math.pi) * math.exp(x * x / 2)
+    return x - u / (1 + x * u / 2)
+
+
+@njit(cache=True, fastmath=True)
+def _n_per_group(p1, p2, z_alpha, z_beta):
+    """Two-proportion sample size per group, fused into a single expression."""
+    p_bar = 0.5 * (p1 + p2)
+    return (p_bar - p_bar * p_bar) * (z_alpha + z_beta) ** 2 * 2.0 / ((p2 - p1) * (p2 - p1))
+
+
+@njit(cache=True)
+def _acklam_z_scores(alpha, power):
+    """Return (z_alpha, z_beta) for a two-sided test via _acklam_ndtri."""
+    return _acklam_ndtri(1 - alpha / 2), _acklam_ndtri(power)
+
+
+@njit(parallel=True, cache=True, fastmath=True)
+def _grid_sweep(p1s, mdes, alpha, power, daily_volume, treatment_split, out):
+    """Fill out[i, j] with (n_per_group, days_needed) for every (p1, MDE) pair."""
+    z_alpha = _acklam_ndtri(1 - alpha / 2)  # Two-sided test
+    z_beta = _acklam_ndtri(power)
+    per_day = daily_volume * min(treatment_split, 1 - treatment_split)
+
+    for i in prange(p1s.size):
+        p1 = p1s[i]
+        for j in range(mdes.size):
+            n = _n_per_group(p1, p1 + mdes[j], z_alpha, z_beta)
+            out[i, j, 0] = math.ceil(n)
+            out[i, j, 1] = math.ceil(n / per_day)
+
+
+# Use Winitzki's approximation instead of scipy for the z-scores. Accurate to
+# about 4 decimals in the normal CDF, which is enough for rough planning.
+# ABTestCalculator reads this when an instance is created.
+USE_FAST_PROBIT = False
+
+
+def _probit_winitzki(p):
+    """
+    Standard normal quantile from Winitzki's invertible CDF approximation.
+
+    Phi(x) ~= 1/2 + 1/2 * sqrt(1 - exp(-x^2 (17 + x^2) / (26.694 + 2 x^2)))
+    is solved for x, giving a quadratic in u = x^2. The CDF of the result is
+    within about 1e-4 of p.
+    """
+    y = (2 * p - 1) ** 2
+    L = -math.log1p(-y)
+    u = (2 * L - 17 + math.sqrt((17 - 2 * L) ** 2 + 4 * 26.694 * L)) / 2
+    return math.copysign(math.sqrt(u), p - 0.5)
+
+
+def _ceil_int(x):
+    """Ceiling of a non-negative float as an int, without math.ceil."""
+    n = int(x)
+    return n + (x > n)
+
+
+def _validate_parameters(p1, p2, alpha, power, daily_volume, treatment_split):
+    """Validate test parameters; p1 and p2 may be scalars or arrays."""
+    if not np.all((p1 > 0) & (p1 < 1)):
+        raise ValueError("baseline_rate must be between 0 and 1")
+    if not np.all((p2 > 0) & (p2 <= 1)):
+        raise ValueError("baseline_rate + MDE must be between 0 and 1")
+    if np.any(p2 == p1):
+        raise ValueError("minimum_detectable_effect must be non-zero")
+    if not 0 < alpha < 1:
+        raise ValueError("alpha must be between 0 and 1")
+    if not 0 < power < 1:
+        raise ValueError("power must be between 0 and 1")
+    if daily_volume <= 0:
+        raise ValueError("daily_volume must be positive")
+    if not 0 < treatment_split < 1:
+        raise ValueError("treatment_split must be between 0 and 1")
+
+
+@functools.lru_cache(maxsize=128)
+def _z_scores(alpha, power, fast=False):
+    """Return (z_alpha, z_beta) for a two-sided test, cached per (alpha, power)."""
+    if fast:
+        probit = _probit_winitzki
+    else:
+        # Imported lazily: scipy is slow to load and unused on the kernel path
+        from scipy.special import ndtri as probit
+    return probit(1 - alpha / 2), probit(power)
+
+
+# Record layout for calculate_sample_size_batch results
+BATCH_RESULTS_DTYPE = np.dtype([
+    ('baseline_rate', 'f8'),
+    ('mde', 'f8'),
+    ('target_rate', 'f8'),
+    ('relative_lift', 'f8'),
+    ('n_per_group', 'i8'),
+    ('total_n', 'i8'),
+    ('days_needed', 'i8'),
+])
+
+
+class ABResults(NamedTuple):
+    """Results of a single sample size calculation."""
+    baseline_rate_pct: float
+    target_rate_pct: float
+    absolute_lift_pp: float
+    relative_lift_pct: float
+    alpha: float
+    power: float
+    z_alpha: float
+    z_beta: float
+    pooled_proportion: float
+    n_per_group: int
+    total_n: int
+    daily_volume: int
+    treatment_split: float
+    control_per_day: float
+    treatment_per_day: float
+    days_needed: int
 
 
 class ABTestCalculator:
@@ -38,6 +217,36 @@ class ABTestCalculator:
         treatment_split : float, default=0.50
             Proportion allocated to treatment group (0.50 = 50/50 split)
         """
+        self._set_parameters(baseline_rate, minimum_detectable_effect,
+                             alpha, power, daily_volume, treatment_split)
+
+        # Validate inputs
+        self._validate_inputs()
+        self._set_z_scores()
+
+    @classmethod
+    def from_validated(cls,
+                       baseline_rate,
+                       minimum_detectable_effect,
+                       alpha=0.05,
+                       power=0.80,
+                       daily_volume=400,
+                       treatment_split=0.50):
+        """
+        Create a calculator without re-running input validation.
+
+        Intended for batch drivers that have already validated the shared
+        parameters. Takes the same parameters as the constructor.
+        """
+        obj = cls.__new__(cls)
+        obj._set_parameters(baseline_rate, minimum_detectable_effect,
+                            alpha, power, daily_volume, treatment_split)
+        obj._set_z_scores()
+        return obj
+
+    def _set_parameters(self, baseline_rate, minimum_detectable_effect,
+                        alpha, power, daily_volume, treatment_split):
+        """Store test parameters on the instance."""
         self.p1 = baseline_rate
         self.mde = minimum_detectable_effect
         self.p2 = baseline_rate + minimum_detectable_effect
@@ -45,24 +254,37 @@ class ABTestCalculator:
         self.power = power
         self.daily_volume = daily_volume
         self.treatment_split = treatment_split
-
-        # Validate inputs
-        self._validate_inputs()
+        # Daily accounts entering the smaller arm
+        self.min_split_volume = daily_volume * min(treatment_split, 1 - treatment_split)
 
     def _validate_inputs(self):
         """Validate input parameters."""
-        if not 0 < self.p1 < 1:
-            raise ValueError("baseline_rate must be between 0 and 1")
-        if not 0 < self.p2 <= 1:
-            raise ValueError("baseline_rate + MDE must be between 0 and 1")
-        if not 0 < self.alpha < 1:
-            raise ValueError("alpha must be between 0 and 1")
-        if not 0 < self.power < 1:
-            raise ValueError("power must be between 0 and 1")
-        if self.daily_volume <= 0:
-            raise ValueError("daily_volume must be positive")
-        if not 0 < self.treatment_split < 1:
-            raise ValueError("treatment_split must be between 0 and 1")
+        _validate_parameters(self.p1, self.p2, self.alpha, self.power,
+                             self.daily_volume, self.treatment_split)
+
+    def _set_z_scores(self):
+        """Compute z-scores once per instance; alpha and power must be valid."""
+        if USE_FAST_PROBIT:
+            self.z_alpha, self.z_beta = _z_scores(self.alpha, self.power, fast=True)
+        else:
+            self.z_alpha, self.z_beta = _acklam_z_scores(self.alpha, self.power)
+
+    def calculate_into(self, out, i):
+        """
+        Write (n_per_group, days_needed) into row i of a preallocated array.
+
+        Avoids building an ABResults per call in tight planning loops.
+
+        Parameters:
+        -----------
+        out : numpy.ndarray
+            Array of shape (N, 2) or larger
+        i : int
+            Row index to write
+        """
+        n_per_group = _n_per_group(self.p1, self.p2, self.z_alpha, self.z_beta)
+        out[i, 0] = _ceil_int(n_per_group)
+        out[i, 1] = _ceil_int(n_per_group / self.min_split_volume)
 
     def calculate_sample_size(self):
         """
@@ -70,23 +292,13 @@ class ABTestCalculator:
 
         Returns:
         --------
-        dict : Dictionary containing all calculation results
+        ABResults : Named tuple containing all calculation results
         """
-        # Calculate z-scores
-        z_alpha = stats.norm.ppf(1 - self.alpha / 2)  # Two-sided test
-        z_beta = stats.norm.ppf(self.power)
-
         # Calculate pooled proportion
         p_bar = (self.p1 + self.p2) / 2
 
-        # Calculate variance components
-        variance = p_bar * (1 - p_bar)
-
-        # Sample size per group formula
-        numerator = 2 * variance * (z_alpha + z_beta) ** 2
-        denominator = (self.p2 - self.p1) ** 2
-
-        n_per_group = numerator / denominator
+        # Sample size per group (z-scores are computed once per instance)
+        n_per_group = _n_per_group(self.p1, self.p2, self.z_alpha, self.z_beta)
 
         # Total sample size
         total_n = 2 * n_per_group
@@ -95,80 +307,99 @@ class ABTestCalculator:
         control_per_day = self.daily_volume * (1 - self.treatment_split)
         treatment_per_day = self.daily_volume * self.treatment_split
 
-        days_needed_treatment = n_per_group / treatment_per_day
-        days_needed_control = n_per_group / control_per_day
-        days_needed = max(days_needed_treatment, days_needed_control)
+        # The smaller arm fills last, so it sets the duration
+        days_needed = n_per_group / self.min_split_volume
 
         # Calculate relative lift
         relative_lift = (self.p2 - self.p1) / self.p1 * 100
 
-        return {
-            'baseline_rate_pct': self.p1 * 100,
-            'target_rate_pct': self.p2 * 100,
-            'absolute_lift_pp': self.mde * 100,
-            'relative_lift_pct': relative_lift,
-            'alpha': self.alpha,
-            'power': self.power,
-            'z_alpha': z_alpha,
-            'z_beta': z_beta,
-            'pooled_proportion': p_bar,
-            'n_per_group': math.ceil(n_per_group),
-            'total_n': math.ceil(total_n),
-            'daily_volume': self.daily_volume,
-            'treatment_split': self.treatment_split,
-            'control_per_day': control_per_day,
-            'treatment_per_day': treatment_per_day,
-            'days_needed': math.ceil(days_needed)
-        }
+        return ABResults(
+            baseline_rate_pct=self.p1 * 100,
+            target_rate_pct=self.p2 * 100,
+            absolute_lift_pp=self.mde * 100,
+            relative_lift_pct=relative_lift,
+            alpha=self.alpha,
+            power=self.power,
+            z_alpha=self.z_alpha,
+            z_beta=self.z_beta,
+            pooled_proportion=p_bar,
+            n_per_group=_ceil_int(n_per_group),
+            total_n=_ceil_int(total_n),
+            daily_volume=self.daily_volume,
+            treatment_split=self.treatment_split,
+            control_per_day=control_per_day,
+            treatment_per_day=treatment_per_day,
+            days_needed=_ceil_int(days_needed)
+        )
 
-    def print_results(self):
-        """Print formatted results."""
-        results = self.calculate_sample_size()
+    def format_results(self, results=None):
+        """
+        Format results as a printable report.
 
-        print("\n" + "="*70)
-        print("A/B TEST SAMPLE SIZE CALCULATION RESULTS")
-        print("="*70)
-
-        print("\n📊 TEST PARAMETERS:")
-        print(f"  Baseline Rate (Control):        {results['baseline_rate_pct']:.1f}%")
-        print(f"  Target Rate (Treatment):        {results['target_rate_pct']:.1f}%")
-        print(f"  Minimum Detectable Effect:      {results['absolute_lift_pp']:.1f} percentage points")
-        print(f"  Relative Lift:                  {results['relative_lift_pct']:.1f}%")
-        print(f"  Significance Level (α):         {results['alpha']}")
-        print(f"  Statistical Power (1-β):        {results['power']}")
-
-        print("\n📈 STATISTICAL VALUES:")
-        print(f"  Z-score (α/2):                  {results['z_alpha']:.3f}")
-        print(f"  Z-score (β):                    {results['z_beta']:.3f}")
-        print(f"  Pooled Proportion (p̄):          {results['pooled_proportion']:.3f}")
-
-        print("\n👥 SAMPLE SIZE REQUIREMENTS:")
-        print(f"  Accounts per Group:             {results['n_per_group']:,}")
-        print(f"  Total Accounts Needed:          {results['total_n']:,}")
-
-        print("\n⏱️  TEST DURATION:")
-        print(f"  Daily Volume:                   {results['daily_volume']:,} accounts/day")
-        print(f"  Treatment Split:                {results['treatment_split']*100:.0f}% / {(1-results['treatment_split'])*100:.0f}%")
-        print(f"  Control Group:                  {results['control_per_day']:.0f} accounts/day")
-        print(f"  Treatment Group:                {results['treatment_per_day']:.0f} accounts/day")
-        print(f"  Days Needed:                    {results['days_needed']} days")
-
-        print("\n💡 RECOMMENDATIONS:")
-        if results['days_needed'] <= 7:
-            print(f"  ✓ Test duration of {results['days_needed']} days is feasible")
-            print(f"    A 1-week test should provide sufficient data")
-        elif results['days_needed'] <= 14:
-            print(f"  ✓ Test duration of {results['days_needed']} days is reasonable")
-            print(f"    A 2-week test window is recommended")
+        Parameters:
+        -----------
+        results : ABResults, optional
+            Precomputed results; calculated if not given
+
+        Returns:
+        --------
+        str : Formatted report
+        """
+        if results is None:
+            results = self.calculate_sample_size()
+
+        lines = []
+
+        lines.append("\n" + "="*70)
+        lines.append("A/B TEST SAMPLE SIZE CALCULATION RESULTS")
+        lines.append("="*70)
+
+        lines.append("\n📊 TEST PARAMETERS:")
+        lines.append(f"  Baseline Rate (Control):        {results.baseline_rate_pct:.1f}%")
+        lines.append(f"  Target Rate (Treatment):        {results.target_rate_pct:.1f}%")
+        lines.append(f"  Minimum Detectable Effect:      {results.absolute_lift_pp:.1f} percentage points")
+        lines.append(f"  Relative Lift:                  {results.relative_lift_pct:.1f}%")
+        lines.append(f"  Significance Level (α):         {results.alpha}")
+        lines.append(f"  Statistical Power (1-β):        {results.power}")
+
+        lines.append("\n📈 STATISTICAL VALUES:")
+        lines.append(f"  Z-score (α/2):                  {results.z_alpha:.3f}")
+        lines.append(f"  Z-score (β):                    {results.z_beta:.3f}")
+        lines.append(f"  Pooled Proportion (p̄):          {results.pooled_proportion:.3f}")
+
+        lines.append("\n👥 SAMPLE SIZE REQUIREMENTS:")
+        lines.append(f"  Accounts per Group:             {results.n_per_group:,}")
+        lines.append(f"  Total Accounts Needed:          {results.total_n:,}")
+
+        lines.append("\n⏱️  TEST DURATION:")
+        lines.append(f"  Daily Volume:                   {results.daily_volume:,} accounts/day")
+        lines.append(f"  Treatment Split:                {results.treatment_split*100:.0f}% / {(1-results.treatment_split)*100:.0f}%")
+        lines.append(f"  Control Group:                  {results.control_per_day:.0f} accounts/day")
+        lines.append(f"  Treatment Group:                {results.treatment_per_day:.0f} accounts/day")
+        lines.append(f"  Days Needed:                    {results.days_needed} days")
+
+        lines.append("\n💡 RECOMMENDATIONS:")
+        if results.days_needed <= 7:
+            lines.append(f"  ✓ Test duration of {results.days_needed} days is feasible")
+            lines.append(f"    A 1-week test should provide sufficient data")
+        elif results.days_needed <= 14:
+            lines.append(f"  ✓ Test duration of {results.days_needed} days is reasonable")
+            lines.append(f"    A 2-week test window is recommended")
         else:
-            print(f"  ⚠ Test duration of {results['days_needed']} days is lengthy")
-            print(f"    Consider:")
-            print(f"    • Increasing MDE (detecting larger effects)")
-            print(f"    • Reducing power to 0.70")
-            print(f"    • Extending test window if acceptable")
+            lines.append(f"  ⚠ Test duration of {results.days_needed} days is lengthy")
+            lines.append(f"    Consider:")
+            lines.append(f"    • Increasing MDE (detecting larger effects)")
+            lines.append(f"    • Reducing power to 0.70")
+            lines.append(f"    • Extending test window if acceptable")
+
+        lines.append("\n" + "="*70 + "\n")
 
-        print("\n" + "="*70 + "\n")
+        return "\n".join(lines)
 
+    def print_results(self):
+        """Print formatted results."""
+        results = self.calculate_sample_size()
+        print(self.format_results(results))
         return results
 
 
@@ -178,15 +409,28 @@ def calculate_baseline_rate(total_accounts, successful_accounts):
 
     Parameters:
     -----------
-    total_accounts : int
-        Total number of accounts in historical period
-    successful_accounts : int
-        Number of accounts that achieved the KPI
+    total_accounts : int or array_like
+        Total number of accounts in historical period, or per-period counts
+        (e.g. one entry per day)
+    successful_accounts : int or array_like
+        Number of accounts that achieved the KPI, matching total_accounts
 
     Returns:
     --------
     float : Baseline rate (proportion)
     """
+    if np.ndim(total_accounts) or np.ndim(successful_accounts):
+        total_accounts = np.asarray(total_accounts)
+        successful_accounts = np.asarray(successful_accounts)
+        if total_accounts.shape != successful_accounts.shape:
+            raise ValueError("total_accounts and successful_accounts must have the same shape")
+        if np.any(successful_accounts < 0) or np.any(successful_accounts > total_accounts):
+            raise ValueError("successful_accounts must be between 0 and total_accounts")
+
+        # Pool the periods into overall counts
+        total_accounts = total_accounts.sum().item()
+        successful_accounts = successful_accounts.sum().item()
+
     if total_accounts <= 0:
         raise ValueError("total_accounts must be positive")
     if successful_accounts < 0 or successful_accounts > total_accounts:
@@ -201,6 +445,196 @@ def calculate_baseline_rate(total_accounts, successful_accounts):
     return baseline_rate
 
 
+def calculate_sample_size_batch(baseline_rates,
+                                minimum_detectable_effects,
+                                alpha=0.05,
+                                power=0.80,
+                                daily_volume=400,
+                                treatment_split=0.50):
+    """
+    Calculate sample sizes for many baseline/MDE combinations at once.
+
+    baseline_rates and minimum_detectable_effects are broadcast against each
+    other, so a scalar baseline with an array of MDEs (or an outer grid via
+    ``p[:, None]`` and ``mde[None, :]``) works directly.
+
+    Parameters:
+    -----------
+    baseline_rates : float or array_like
+        Historical conversion/success rates
+    minimum_detectable_effects : float or array_like
+        Absolute minimum effects to detect
+    alpha : float, default=0.05
+        Significance level (Type I error rate)
+    power : float, default=0.80
+        Statistical power (1 - Type II error rate)
+    daily_volume : int, default=400
+        Number of new eligible accounts per day
+    treatment_split : float, default=0.50
+        Proportion allocated to treatment group
+
+    Returns:
+    --------
+    numpy.ndarray : Structured array of BATCH_RESULTS_DTYPE records with the
+                    broadcast shape of the inputs, so results can be sorted or
+                    filtered column-wise, e.g. ``out[out['days_needed'] <= 14]``
+    """
+    p1 = np.asarray(baseline_rates, dtype=np.float64)
+    mde = np.asarray(minimum_detectable_effects, dtype=np.float64)
+    p2 = p1 + mde
+
+    _validate_parameters(p1, p2, alpha, power, daily_volume, treatment_split)
+
+    # z-scores depend only on alpha/power, so they are scalars for the batch
+    z_alpha, z_beta = _z_scores(alpha, power, fast=USE_FAST_PROBIT)
+
+    p_bar = 0.5 * (p1 + p2)
+    n = 2 * p_bar * (1 - p_bar) * (z_alpha + z_beta) ** 2 / mde ** 2
+    days = n / (daily_volume * min(treatment_split, 1 - treatment_split))
+
+    out = np.empty(n.shape, dtype=BATCH_RESULTS_DTYPE)
+    out['baseline_rate'] = p1
+    out['mde'] = mde
+    out['target_rate'] = p2
+    out['relative_lift'] = mde / p1
+    out['n_per_group'] = np.ceil(n)
+    out['total_n'] = np.ceil(2 * n)
+    out['days_needed'] = np.ceil(days)
+    return out
+
+
+def grid_sweep(baseline_rates,
+               minimum_detectable_effects,
+               alpha=0.05,
+               power=0.80,
+               daily_volume=400,
+               treatment_split=0.50):
+    """
+    Calculate sample size and duration over a baseline x MDE grid.
+
+    Rows are evaluated in parallel when numba is available.
+
+    Parameters:
+    -----------
+    baseline_rates : array_like
+        1-D array of historical conversion/success rates
+    minimum_detectable_effects : array_like
+        1-D array of absolute minimum effects to detect
+    alpha : float, default=0.05
+        Significance level (Type I error rate)
+    power : float, default=0.80
+        Statistical power (1 - Type II error rate)
+    daily_volume : int, default=400
+        Number of new eligible accounts per day
+    treatment_split : float, default=0.50
+        Proportion allocated to treatment group
+
+    Returns:
+    --------
+    numpy.ndarray : int64 array of shape (len(baseline_rates),
+                    len(minimum_detectable_effects), 2) holding
+                    (n_per_group, days_needed) for each pair
+    """
+    p1s = np.ascontiguousarray(baseline_rates, dtype=np.float64)
+    mdes = np.ascontiguousarray(minimum_detectable_effects, dtype=np.float64)
+    if p1s.ndim != 1 or mdes.ndim != 1:
+        raise ValueError("baseline_rates and minimum_detectable_effects must be 1-D")
+
+    # Validate from the extremes rather than materialising the full p2 grid
+    p1_range = np.array([p1s.min(), p1s.max()]) if p1s.size else p1s
+    mde_range = np.array([mdes.min(), mdes.max()]) if mdes.size else mdes
+    _validate_parameters(p1_range[:, None], p1_range[:, None] + mde_range[None, :],
+                         alpha, power, daily_volume, treatment_split)
+    if np.any(mdes == 0):
+        raise ValueError("minimum_detectable_effect must be non-zero")
+
+    out = np.empty((p1s.size, mdes.size, 2), dtype=np.int64)
+    _grid_sweep(p1s, mdes, float(alpha), float(power), float(daily_volume),
+                float(treatment_split), out)
+    return out
+
+
+# Float steps solve_mde may take past the closed-form root
+_SOLVE_MDE_MAX_STEPS = 8
+
+
+def solve_mde(baseline_rate,
+              days,
+              daily_volume=400,
+              treatment_split=0.50,
+              alpha=0.05,
+              power=0.80):
+    """
+    Calculate the smallest detectable effect for a fixed test duration.
+
+    Inverts the two-proportion formula: with p_bar = p1 + MDE/2 the sample
+    size equation is a quadratic in MDE, solved in closed form. The root is
+    then nudged up by at most a few floats so that the returned MDE is
+    guaranteed to fit within the requested number of days.
+
+    Parameters:
+    -----------
+    baseline_rate : float
+        Historical conversion/success rate (e.g., 0.20 for 20%)
+    days : float
+        Number of days the test will run; partial days are ignored
+    daily_volume : int, default=400
+        Number of new eligible accounts per day
+    treatment_split : float, default=0.50
+        Proportion allocated to treatment group
+    alpha : float, default=0.05
+        Significance level (Type I error rate)
+    power : float, default=0.80
+        Statistical power (1 - Type II error rate)
+
+    Returns:
+    --------
+    float : Minimum detectable effect (absolute, e.g. 0.05 for 5 percentage points)
+    """
+    if not 0 < baseline_rate < 1:
+        raise ValueError("baseline_rate must be between 0 and 1")
+    if days < 1:
+        raise ValueError("days must be at least 1")
+    if not 0 < alpha < 1:
+        raise ValueError("alpha must be between 0 and 1")
+    if not 0 < power < 1:
+        raise ValueError("power must be between 0 and 1")
+    if daily_volume <= 0:
+        raise ValueError("daily_volume must be positive")
+    if not 0 < treatment_split < 1:
+        raise ValueError("treatment_split must be between 0 and 1")
+
+    # Durations are reported in whole days, so only complete days count
+    days = math.floor(days)
+
+    # Accounts per group reachable in the given window (limited by the smaller arm)
+    n = days * daily_volume * min(treatment_split, 1 - treatment_split)
+    z_alpha, z_beta = _z_scores(alpha, power, fast=USE_FAST_PROBIT)
+
+    # n * mde^2 = 2 * p_bar * (1 - p_bar) * (z_alpha + z_beta)^2, p_bar = p1 + mde/2
+    c = 2 * (z_alpha + z_beta) ** 2 / n
+    a = 1 + c / 4
+    b = c * (0.5 - baseline_rate)
+    mde = (b + math.sqrt(b * b + 4 * a * c * baseline_rate * (1 - baseline_rate))) / (2 * a)
+
+    # Round-off can leave the exact root just short of fitting. The kernel only
+    # sees MDE through p2 - p1, so step p2 one float at a time and re-check;
+    # one or two steps are enough in practice
+    p2 = baseline_rate + mde
+    for _ in range(_SOLVE_MDE_MAX_STEPS):
+        if p2 > 1:
+            raise ValueError("no detectable effect within the given duration")
+        mde = p2 - baseline_rate
+        calc = ABTestCalculator.from_validated(baseline_rate, mde, alpha, power,
+                                               daily_volume, treatment_split)
+        n_per_group = _n_per_group(calc.p1, calc.p2, calc.z_alpha, calc.z_beta)
+        if _ceil_int(n_per_group / calc.min_split_volume) <= days:
+            return mde
+        p2 = math.nextafter(p2, math.inf)
+
+    raise RuntimeError("solve_mde did not converge")
+
+
 def sensitivity_analysis(baseline_rate, daily_volume=400, alpha=0.05, power=0.80):
     """
     Run sensitivity analysis for different MDE values.
@@ -216,33 +650,29 @@ def sensitivity_analysis(baseline_rate, daily_volume=400, alpha=0.05, power=0.80
     power : float
         Statistical power
     """
-    print("\n" + "="*70)
-    print("SENSITIVITY ANALYSIS - Varying Minimum Detectable Effect")
-    print("="*70)
-
-    mde_values = [0.02, 0.03, 0.04, 0.05, 0.06, 0.08, 0.10]
-
-    print(f"\n{'MDE (pp)':<12} {'Target %':<12} {'Rel. Lift':<12} {'n/group':<12} {'Total n':<12} {'Days':<8}")
-    print("-" * 70)
-
-    for mde in mde_values:
-        if baseline_rate + mde > 1.0:
-            continue
-
-        calc = ABTestCalculator(
-            baseline_rate=baseline_rate,
-            minimum_detectable_effect=mde,
-            alpha=alpha,
-            power=power,
-            daily_volume=daily_volume
-        )
-        results = calc.calculate_sample_size()
-
-        print(f"{mde*100:<12.1f} {results['target_rate_pct']:<12.1f} "
-              f"{results['relative_lift_pct']:<12.1f} {results['n_per_group']:<12,} "
-              f"{results['total_n']:<12,} {results['days_needed']:<8}")
-
-    print("="*70 + "\n")
+    mde = np.array([0.02, 0.03, 0.04, 0.05, 0.06, 0.08, 0.10])
+    mde = mde[baseline_rate + mde <= 1.0]
+
+    batch = calculate_sample_size_batch(baseline_rate, mde, alpha=alpha,
+                                        power=power, daily_volume=daily_volume)
+
+    rows = [
+        f"{mde[i]*100:<12.1f} {batch['target_rate'][i]*100:<12.1f} "
+        f"{batch['relative_lift'][i]*100:<12.1f} {batch['n_per_group'][i]:<12,} "
+        f"{batch['total_n'][i]:<12,} {batch['days_needed'][i]:<8}"
+        for i in range(mde.size)
+    ]
+
+    # Emit the whole table in one write rather than a print per row
+    sys.stdout.write("\n".join([
+        "\n" + "="*70,
+        "SENSITIVITY ANALYSIS - Varying Minimum Detectable Effect",
+        "="*70,
+        f"\n{'MDE (pp)':<12} {'Target %':<12} {'Rel. Lift':<12} {'n/group':<12} {'Total n':<12} {'Days':<8}",
+        "-" * 70,
+        *rows,
+        "="*70 + "\n",
+    ]) + "\n")
 
 
 # Example usage and main execution
@@ -0,0 +1,183 @@
+import itertools
+
+import numpy as np
+import pytest
+from scipy.special import ndtr, ndtri
+
+import ab_test_calculator
+from ab_test_calculator import (
+    BATCH_RESULTS_DTYPE,
+    ABTestCalculator,
+    _acklam_ndtri,
+    _probit_winitzki,
+    calculate_baseline_rate,
+    calculate_sample_size_batch,
+    grid_sweep,
+    solve_mde,
+)
+
+
+@pytest.mark.parametrize("p", [
+    *np.logspace(-15, np.log10(0.02425), 25),
+    0.02425, np.nextafter(0.02425, 0), np.nextafter(0.02425, 1),
+    *np.linspace(0.03, 0.97, 25),
+    0.97575, np.nextafter(0.97575, 0), np.nextafter(0.97575, 1),
+    *(1 - np.logspace(-15, np.log10(0.02425), 25)),
+])
+def test_acklam_ndtri_matches_scipy(p):
+    assert _acklam_ndtri(p) == pytest.approx(ndtri(p), rel=1e-14, abs=1e-15)
+
+
+@pytest.mark.parametrize("p", [1e-6, 1e-3, *np.linspace(0.01, 0.99, 99), 1 - 1e-3, 1 - 1e-6])
+def test_probit_winitzki_error_bound(p):
+    assert abs(ndtr(_probit_winitzki(p)) - p) < 1e-4
+
+
+def test_use_fast_probit_switches_all_paths(monkeypatch):
+    # A small MDE gives sample sizes large enough to expose the ~1e-4 error
+    def run():
+        return (ABTestCalculator(0.2, 0.001).calculate_sample_size(),
+                calculate_sample_size_batch(0.2, 0.001),
+                solve_mde(0.2, 14))
+
+    exact_results, exact_batch, exact_mde = run()
+    monkeypatch.setattr(ab_test_calculator, "USE_FAST_PROBIT", True)
+    fast_results, fast_batch, fast_mde = run()
+
+    assert fast_results.z_alpha == _probit_winitzki(0.975)
+    assert fast_results.n_per_group != exact_results.n_per_group
+    assert fast_batch['n_per_group'] != exact_batch['n_per_group']
+    assert fast_mde != exact_mde
+
+    monkeypatch.setattr(ab_test_calculator, "USE_FAST_PROBIT", False)
+    assert run()[0] == exact_results
+
+
+@pytest.mark.parametrize("baseline_rate, mde", [(0.01, 0.005), (0.2, 0.05), (0.5, -0.1), (0.9, 0.03)])
+@pytest.mark.parametrize("alpha, power", [(0.05, 0.80), (0.01, 0.90), (0.10, 0.70)])
+def test_calculate_sample_size_matches_batch(baseline_rate, mde, alpha, power):
+    results = ABTestCalculator(baseline_rate, mde, alpha=alpha, power=power).calculate_sample_size()
+    batch = calculate_sample_size_batch(baseline_rate, mde, alpha=alpha, power=power)
+
+    assert results.z_alpha == pytest.approx(ndtri(1 - alpha / 2), rel=1e-14)
+    assert results.z_beta == pytest.approx(ndtri(power), rel=1e-14)
+    assert results.n_per_group == batch['n_per_group']
+    assert results.total_n == batch['total_n']
+    assert results.days_needed == batch['days_needed']
+
+
+@pytest.mark.parametrize(
+    "baseline_rate, days, treatment_split, daily_volume",
+    [*itertools.product([0.01, 0.05, 0.2, 0.5, 0.9], [1, 7, 14, 30, 90], [0.3, 0.5], [400]),
+     *itertools.product([0.01, 0.2, 0.833], [30, 90], [0.5], [1e5, 1e6])],
+)
+def test_solve_mde_round_trip(baseline_rate, days, treatment_split, daily_volume):
+    params = {"treatment_split": treatment_split, "daily_volume": daily_volume}
+    mde = solve_mde(baseline_rate, days, **params)
+
+    results = ABTestCalculator(baseline_rate, mde, **params).calculate_sample_size()
+    assert results.days_needed <= days
+
+    # Anything noticeably smaller no longer fits in the window
+    smaller = ABTestCalculator(baseline_rate, mde * (1 - 1e-6), **params).calculate_sample_size()
+    assert smaller.days_needed > days
+
+
+def test_solve_mde_ignores_partial_days():
+    assert solve_mde(0.2, 7.9) == solve_mde(0.2, 7)
+
+
+@pytest.mark.parametrize("kwargs", [{"alpha": 1.5}, {"alpha": 0.0},
+                                    {"power": 0.0}, {"power": 1.0},
+                                    {"days": 0.5}])
+def test_solve_mde_rejects_invalid_parameters(kwargs):
+    params = {"baseline_rate": 0.2, "days": 14, **kwargs}
+    with pytest.raises(ValueError):
+        solve_mde(**params)
+
+
+def test_grid_sweep_matches_batch():
+    p = np.linspace(0.01, 0.6, 40)
+    d = np.concatenate([np.linspace(-0.009, -0.001, 9), np.linspace(0.001, 0.3, 30)])
+    grid = grid_sweep(p, d, daily_volume=350, treatment_split=0.4)
+    batch = calculate_sample_size_batch(p[:, None], d[None, :], daily_volume=350, treatment_split=0.4)
+
+    np.testing.assert_array_equal(grid[..., 0], batch['n_per_group'])
+    np.testing.assert_array_equal(grid[..., 1], batch['days_needed'])
+
+
+@pytest.mark.parametrize("baseline_rates, mdes", [
+    ([0.0, 0.2], [0.05]),
+    ([0.2, 0.96], [0.01, 0.05]),
+    ([0.2], [0.05, 0.0, 0.1]),
+    ([0.2], [-0.3, 0.05]),
+])
+def test_grid_sweep_rejects_invalid_grid(baseline_rates, mdes):
+    with pytest.raises(ValueError):
+        grid_sweep(baseline_rates, mdes)
+
+
+@pytest.mark.parametrize("baseline_rate, mde, treatment_split", [(0.2, 0.05, 0.5), (0.05, 0.01, 0.3), (0.6, -0.04, 0.8)])
+def test_calculate_into_matches_calculate_sample_size(baseline_rate, mde, treatment_split):
+    calc = ABTestCalculator(baseline_rate, mde, treatment_split=treatment_split)
+    out = np.zeros((3, 2), dtype=np.int64)
+    calc.calculate_into(out, 1)
+
+    results = calc.calculate_sample_size()
+    assert out[1].tolist() == [results.n_per_group, results.days_needed]
+    assert not out[[0, 2]].any()
+
+
+def test_calculate_baseline_rate_pools_per_period_counts():
+    totals = np.array([400, 380, 420, 300])
+    successes = np.array([80, 70, 95, 55])
+    assert calculate_baseline_rate(totals, successes) == 300 / 1500
+    assert calculate_baseline_rate(totals.tolist(), successes.tolist()) == 300 / 1500
+
+
+def test_calculate_baseline_rate_array_matches_scalar_for_float_counts():
+    assert calculate_baseline_rate([10.6, 10.6], [5, 5]) == calculate_baseline_rate(21.2, 10)
+
+
+@pytest.mark.parametrize("totals, successes, message", [
+    ([400, 380], [80, 70, 95], "same shape"),
+    ([400, 50], [80, 70], "between 0 and total_accounts"),
+    ([400, 50], [80, -1], "between 0 and total_accounts"),
+    ([], [], "total_accounts must be positive"),
+])
+def test_calculate_baseline_rate_rejects_invalid_arrays(totals, successes, message):
+    with pytest.raises(ValueError, match=message):
+        calculate_baseline_rate(totals, successes)
+
+
+def test_calculate_sample_size_batch_fields_match_calculator():
+    p1 = np.array([0.05, 0.2, 0.2, 0.6])
+    mde = np.array([0.01, 0.05, 0.1, -0.04])
+    out = calculate_sample_size_batch(p1, mde, daily_volume=300, treatment_split=0.4)
+
+    assert out.dtype == BATCH_RESULTS_DTYPE
+    assert out.shape == (4,)
+    for row, baseline_rate, effect in zip(out, p1, mde):
+        results = ABTestCalculator(baseline_rate, effect, daily_volume=300,
+                                   treatment_split=0.4).calculate_sample_size()
+        assert row['baseline_rate'] == baseline_rate
+        assert row['mde'] == effect
+        assert row['target_rate'] * 100 == pytest.approx(results.target_rate_pct)
+        assert row['relative_lift'] * 100 == pytest.approx(results.relative_lift_pct)
+        assert row['n_per_group'] == results.n_per_group
+        assert row['total_n'] == results.total_n
+        assert row['days_needed'] == results.days_needed
+
+
+def test_calculate_sample_size_batch_rejects_zero_mde():
+    with pytest.raises(ValueError, match="non-zero"):
+        calculate_sample_size_batch(0.2, [0.05, 0.0])
+
+
+def test_calculate_sample_size_batch_filters_by_duration():
+    out = calculate_sample_size_batch(0.2, np.array([0.02, 0.03, 0.05, 0.08]))
+    feasible = out[out['days_needed'] <= 14]
+
+    assert feasible.dtype == BATCH_RESULTS_DTYPE
+    assert feasible['mde'].tolist() == [0.05, 0.08]
+    assert (feasible['days_needed'] <= 14).all()